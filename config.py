@@ -43,3 +43,7 @@ ALLOWED_ORIGINS = [
 if CORS_ORIGINS_ENV:
     additional_origins = [origin.strip() for origin in CORS_ORIGINS_ENV.split(",")]
     ALLOWED_ORIGINS.extend(additional_origins)
+
+# Normalize once at import: strip trailing slashes, drop empties and
+# duplicates, and sort for a deterministic list.
+ALLOWED_ORIGINS = sorted({o.strip().rstrip('/') for o in ALLOWED_ORIGINS if o})
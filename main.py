@@ -7,6 +7,8 @@ Run with: uvicorn main:app --reload --port 8000
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from config import ALLOWED_ORIGINS
 from routes.auth_routes import router as auth_router
@@ -20,6 +22,9 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    # orjson serializes dicts straight to bytes, skipping jsonable_encoder
+    # and the stdlib json.dumps on every response
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -31,27 +36,82 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses; the registry/insights payloads compress ~10x
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
-# Custom middleware to add cache-control headers to all responses
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 
+# Full-document GETs manage their own ETag-based revalidation; the blanket
+# no-store headers would defeat the 304 path for them.
+CACHE_EXEMPT_PATHS = {"/api/registries/all", "/api/insights/all"}
 
-class CacheControlMiddleware(BaseHTTPMiddleware):
-    """Middleware to add cache-control headers to prevent stale data issues."""
-    
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        # Add cache control headers to prevent browser caching of API responses
-        if request.url.path.startswith("/api"):
-            response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
-        return response
+
+class CacheControlMiddleware:
+    """Pure ASGI middleware adding cache-control headers to API responses.
+
+    Implemented directly against the ASGI protocol rather than
+    BaseHTTPMiddleware, which builds a Request object and spawns an anyio
+    task per request; non-/api traffic passes straight through.
+    """
+
+    _CACHE_HEADERS = [
+        (b"cache-control", b"no-cache, no-store, must-revalidate"),
+        (b"pragma", b"no-cache"),
+        (b"expires", b"0"),
+    ]
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith("/api")
+            or (scope["method"] == "GET" and scope["path"] in CACHE_EXEMPT_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", []).extend(self._CACHE_HEADERS)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 app.add_middleware(CacheControlMiddleware)
 
+from utils import ConcurrentModificationError
+
+
+@app.exception_handler(ConcurrentModificationError)
+async def concurrent_modification_handler(request, exc):
+    """Map lost-update conflicts from the storage layer to a 409."""
+    return ORJSONResponse(status_code=409, content={"detail": str(exc)})
+
+
+@app.on_event("startup")
+async def warm_caches():
+    """Warm the GCS client and pre-load data so the first request is a cache hit.
+
+    The lazy Client() construction otherwise pays auth metadata + token fetch
+    latency on the first user request. Failures here are non-fatal; requests
+    fall back to the lazy path.
+    """
+    import asyncio
+
+    from config import USE_GCS
+    from utils import get_gcs_client, get_registry_data, get_insights_data
+
+    try:
+        if USE_GCS:
+            get_gcs_client()
+        await asyncio.to_thread(get_registry_data)
+        await asyncio.to_thread(get_insights_data)
+    except Exception:
+        pass
+
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(registry_router)
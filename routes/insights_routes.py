@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response
 from typing import List, Optional
 from pydantic import BaseModel
 
 from auth import User, get_current_user
-from utils import get_insights_data, save_insights_data
+from utils import (
+    aget_insights_data,
+    aget_insights_payload,
+    aget_insights_data_with_generation,
+    asave_insights_data,
+)
 
 
 router = APIRouter(prefix="/api/insights", tags=["Insights"])
@@ -69,11 +75,20 @@ class MessageResponse(BaseModel):
 # ============ GET Endpoints ============
 
 @router.get("/all")
-async def get_all_insights(current_user: User = Depends(get_current_user)):
-    """Get all insights data."""
+async def get_all_insights(request: Request, fresh: bool = False,
+                           current_user: User = Depends(get_current_user)):
+    """Get all insights data. ?fresh=1 bypasses the cache."""
     try:
-        data = get_insights_data()
-        return data
+        # Return the cached serialized bytes directly, skipping the
+        # per-request re-encode in the response layer. The etag (derived from
+        # the GCS generation) lets unchanged polls answer with an empty 304.
+        payload, etag = await aget_insights_payload(fresh)
+        headers = {"Cache-Control": "private, max-age=0, must-revalidate"}
+        if etag:
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers={**headers, "ETag": etag})
+            headers["ETag"] = etag
+        return Response(content=payload, media_type="application/json", headers=headers)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -83,21 +98,21 @@ async def get_all_insights(current_user: User = Depends(get_current_user)):
 @router.get("/carbon")
 async def get_carbon_insights(current_user: User = Depends(get_current_user)):
     """Get carbon credits insights data."""
-    data = get_insights_data()
+    data = await aget_insights_data()
     return data.get('carbonCredits', {})
 
 
 @router.get("/rec")
 async def get_rec_insights(current_user: User = Depends(get_current_user)):
     """Get REC insights data."""
-    data = get_insights_data()
+    data = await aget_insights_data()
     return data.get('renewableEnergyCertificates', {})
 
 
 @router.get("/carbon/{registry_id}")
 async def get_carbon_registry_insights(registry_id: str, current_user: User = Depends(get_current_user)):
     """Get a specific carbon registry's insights."""
-    data = get_insights_data()
+    data = await aget_insights_data()
     for registry in data.get('carbonCredits', {}).get('registries', []):
         if registry.get('id') == registry_id:
             return registry
@@ -107,7 +122,7 @@ async def get_carbon_registry_insights(registry_id: str, current_user: User = De
 @router.get("/rec/{registry_id}")
 async def get_rec_registry_insights(registry_id: str, current_user: User = Depends(get_current_user)):
     """Get a specific REC registry's insights."""
-    data = get_insights_data()
+    data = await aget_insights_data()
     for registry in data.get('renewableEnergyCertificates', {}).get('registries', []):
         if registry.get('id') == registry_id:
             return registry
@@ -122,9 +137,9 @@ async def update_carbon_summary(
     current_user: User = Depends(get_current_user)
 ):
     """Update carbon credits summary."""
-    data = get_insights_data()
+    data, generation = await aget_insights_data_with_generation()
     data['carbonCredits']['summary'] = summary.model_dump()
-    save_insights_data(data)
+    await asave_insights_data(data, generation)
     return MessageResponse(message="Carbon summary updated successfully")
 
 
@@ -134,9 +149,9 @@ async def update_rec_summary(
     current_user: User = Depends(get_current_user)
 ):
     """Update REC summary."""
-    data = get_insights_data()
+    data, generation = await aget_insights_data_with_generation()
     data['renewableEnergyCertificates']['summary'] = summary.model_dump()
-    save_insights_data(data)
+    await asave_insights_data(data, generation)
     return MessageResponse(message="REC summary updated successfully")
 
 
@@ -149,13 +164,13 @@ async def update_carbon_registry_insights(
     current_user: User = Depends(get_current_user)
 ):
     """Update a carbon registry's insights data."""
-    data = get_insights_data()
+    data, generation = await aget_insights_data_with_generation()
     registries = data.get('carbonCredits', {}).get('registries', [])
     
     for i, r in enumerate(registries):
         if r.get('id') == registry_id:
             registries[i] = registry.model_dump()
-            save_insights_data(data)
+            await asave_insights_data(data, generation)
             return MessageResponse(message=f"Carbon registry '{registry.name}' insights updated")
     
     raise HTTPException(status_code=404, detail=f"Carbon registry '{registry_id}' not found in insights")
@@ -168,13 +183,13 @@ async def update_rec_registry_insights(
     current_user: User = Depends(get_current_user)
 ):
     """Update a REC registry's insights data."""
-    data = get_insights_data()
+    data, generation = await aget_insights_data_with_generation()
     registries = data.get('renewableEnergyCertificates', {}).get('registries', [])
     
     for i, r in enumerate(registries):
         if r.get('id') == registry_id:
             registries[i] = registry.model_dump()
-            save_insights_data(data)
+            await asave_insights_data(data, generation)
             return MessageResponse(message=f"REC registry '{registry.name}' insights updated")
     
     raise HTTPException(status_code=404, detail=f"REC registry '{registry_id}' not found in insights")
@@ -186,7 +201,7 @@ async def add_carbon_registry_insights(
     current_user: User = Depends(get_current_user)
 ):
     """Add a new carbon registry to insights."""
-    data = get_insights_data()
+    data, generation = await aget_insights_data_with_generation()
     registries = data.get('carbonCredits', {}).get('registries', [])
     
     # Check if already exists
@@ -195,7 +210,7 @@ async def add_carbon_registry_insights(
             raise HTTPException(status_code=400, detail=f"Registry '{registry.id}' already exists in carbon insights")
     
     registries.append(registry.model_dump())
-    save_insights_data(data)
+    await asave_insights_data(data, generation)
     return MessageResponse(message=f"Carbon registry '{registry.name}' added to insights")
 
 
@@ -205,7 +220,7 @@ async def add_rec_registry_insights(
     current_user: User = Depends(get_current_user)
 ):
     """Add a new REC registry to insights."""
-    data = get_insights_data()
+    data, generation = await aget_insights_data_with_generation()
     registries = data.get('renewableEnergyCertificates', {}).get('registries', [])
     
     for r in registries:
@@ -213,7 +228,7 @@ async def add_rec_registry_insights(
             raise HTTPException(status_code=400, detail=f"Registry '{registry.id}' already exists in REC insights")
     
     registries.append(registry.model_dump())
-    save_insights_data(data)
+    await asave_insights_data(data, generation)
     return MessageResponse(message=f"REC registry '{registry.name}' added to insights")
 
 
@@ -223,13 +238,13 @@ async def delete_carbon_registry_insights(
     current_user: User = Depends(get_current_user)
 ):
     """Delete a carbon registry from insights."""
-    data = get_insights_data()
+    data, generation = await aget_insights_data_with_generation()
     registries = data.get('carbonCredits', {}).get('registries', [])
     
     for i, r in enumerate(registries):
         if r.get('id') == registry_id:
             del registries[i]
-            save_insights_data(data)
+            await asave_insights_data(data, generation)
             return MessageResponse(message=f"Carbon registry '{registry_id}' removed from insights")
     
     raise HTTPException(status_code=404, detail=f"Carbon registry '{registry_id}' not found in insights")
@@ -241,13 +256,13 @@ async def delete_rec_registry_insights(
     current_user: User = Depends(get_current_user)
 ):
     """Delete a REC registry from insights."""
-    data = get_insights_data()
+    data, generation = await aget_insights_data_with_generation()
     registries = data.get('renewableEnergyCertificates', {}).get('registries', [])
     
     for i, r in enumerate(registries):
         if r.get('id') == registry_id:
             del registries[i]
-            save_insights_data(data)
+            await asave_insights_data(data, generation)
             return MessageResponse(message=f"REC registry '{registry_id}' removed from insights")
     
     raise HTTPException(status_code=404, detail=f"REC registry '{registry_id}' not found in insights")
@@ -303,7 +318,7 @@ async def update_carbon_subsector(
     current_user: User = Depends(get_current_user)
 ):
     """Update a specific subsector in carbon insights."""
-    data = get_insights_data()
+    data, generation = await aget_insights_data_with_generation()
     
     for registry in data.get('carbonCredits', {}).get('registries', []):
         if registry.get('id') == registry_id:
@@ -316,7 +331,7 @@ async def update_carbon_subsector(
                             recalculate_registry_totals(registry)
                             # Recalculate summary totals from all registries
                             recalculate_summary_totals(data, 'carbon')
-                            save_insights_data(data)
+                            await asave_insights_data(data, generation)
                             return MessageResponse(message=f"Subsector '{subsector_name}' updated")
                     raise HTTPException(status_code=404, detail=f"Subsector '{subsector_name}' not found")
             raise HTTPException(status_code=404, detail=f"Sector '{sector_name}' not found")
@@ -332,7 +347,7 @@ async def update_rec_subsector(
     current_user: User = Depends(get_current_user)
 ):
     """Update a specific subsector in REC insights."""
-    data = get_insights_data()
+    data, generation = await aget_insights_data_with_generation()
     
     for registry in data.get('renewableEnergyCertificates', {}).get('registries', []):
         if registry.get('id') == registry_id:
@@ -345,7 +360,7 @@ async def update_rec_subsector(
                             recalculate_registry_totals(registry)
                             # Recalculate summary totals from all registries
                             recalculate_summary_totals(data, 'rec')
-                            save_insights_data(data)
+                            await asave_insights_data(data, generation)
                             return MessageResponse(message=f"Subsector '{subsector_name}' updated")
                     raise HTTPException(status_code=404, detail=f"Subsector '{subsector_name}' not found")
             raise HTTPException(status_code=404, detail=f"Sector '{sector_name}' not found")
@@ -357,7 +372,7 @@ async def update_rec_subsector(
 @router.get("/trends")
 async def get_market_trends(current_user: User = Depends(get_current_user)):
     """Get market trends data."""
-    data = get_insights_data()
+    data = await aget_insights_data()
     return data.get('marketTrends', {})
 
 
@@ -367,9 +382,9 @@ async def update_growing_sectors(
     current_user: User = Depends(get_current_user)
 ):
     """Update top growing sectors."""
-    data = get_insights_data()
+    data, generation = await aget_insights_data_with_generation()
     data['marketTrends']['topGrowingSectors'] = [s.model_dump() for s in sectors]
-    save_insights_data(data)
+    await asave_insights_data(data, generation)
     return MessageResponse(message="Growing sectors updated successfully")
 
 
@@ -379,7 +394,7 @@ async def update_region_breakdown(
     current_user: User = Depends(get_current_user)
 ):
     """Update region breakdown."""
-    data = get_insights_data()
+    data, generation = await aget_insights_data_with_generation()
     data['marketTrends']['regionBreakdown'] = [r.model_dump() for r in regions]
-    save_insights_data(data)
+    await asave_insights_data(data, generation)
     return MessageResponse(message="Region breakdown updated successfully")
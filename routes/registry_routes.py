@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import Response
 from typing import Optional
 
 from auth import User, get_current_user
@@ -9,12 +10,14 @@ from models import (
     MessageResponse,
 )
 from utils import (
-    get_registry_data,
-    save_registry_data,
+    RegistryIndex,
+    aget_registry_data,
+    aget_registry_data_with_generation,
+    aget_registry_payload,
+    alist_carbon_registries,
+    alist_rec_registries,
+    asave_registry_data,
     calculate_totals,
-    update_registry_in_list,
-    add_registry_to_list,
-    delete_registry_from_list,
 )
 
 router = APIRouter(prefix="/api/registries", tags=["Registries"])
@@ -23,11 +26,20 @@ router = APIRouter(prefix="/api/registries", tags=["Registries"])
 # ============ GET Endpoints ============
 
 @router.get("/all")
-async def get_all_registries(current_user: User = Depends(get_current_user)):
-    """Get all registry data (requires authentication)."""
+async def get_all_registries(request: Request, fresh: bool = False,
+                             current_user: User = Depends(get_current_user)):
+    """Get all registry data (requires authentication). ?fresh=1 bypasses the cache."""
     try:
-        data = get_registry_data()
-        return data
+        # Return the cached serialized bytes directly, skipping the
+        # per-request re-encode in the response layer. The etag (derived from
+        # the GCS generation) lets unchanged polls answer with an empty 304.
+        payload, etag = await aget_registry_payload(fresh)
+        headers = {"Cache-Control": "private, max-age=0, must-revalidate"}
+        if etag:
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers={**headers, "ETag": etag})
+            headers["ETag"] = etag
+        return Response(content=payload, media_type="application/json", headers=headers)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -37,28 +49,26 @@ async def get_all_registries(current_user: User = Depends(get_current_user)):
 @router.get("/carbon")
 async def get_carbon_registries(current_user: User = Depends(get_current_user)):
     """Get all carbon registries."""
-    data = get_registry_data()
-    return data.get('carbonRegistries', [])
+    return await alist_carbon_registries()
 
 
 @router.get("/rec")
 async def get_rec_registries(current_user: User = Depends(get_current_user)):
     """Get all REC registries."""
-    data = get_registry_data()
-    return data.get('recRegistries', [])
+    return await alist_rec_registries()
 
 
 @router.get("/ets")
 async def get_ets_registries(current_user: User = Depends(get_current_user)):
     """Get all ETS registries."""
-    data = get_registry_data()
+    data = await aget_registry_data()
     return data.get('etsRegistries', [])
 
 
 @router.get("/carbon/{registry_id}")
 async def get_carbon_registry(registry_id: str, current_user: User = Depends(get_current_user)):
     """Get a specific carbon registry by ID."""
-    data = get_registry_data()
+    data = await aget_registry_data()
     for registry in data.get('carbonRegistries', []):
         if registry.get('id') == registry_id:
             return registry
@@ -68,7 +78,7 @@ async def get_carbon_registry(registry_id: str, current_user: User = Depends(get
 @router.get("/rec/{registry_id}")
 async def get_rec_registry(registry_id: str, current_user: User = Depends(get_current_user)):
     """Get a specific REC registry by ID."""
-    data = get_registry_data()
+    data = await aget_registry_data()
     for registry in data.get('recRegistries', []):
         if registry.get('id') == registry_id:
             return registry
@@ -78,7 +88,7 @@ async def get_rec_registry(registry_id: str, current_user: User = Depends(get_cu
 @router.get("/ets/{registry_id}")
 async def get_ets_registry(registry_id: str, current_user: User = Depends(get_current_user)):
     """Get a specific ETS registry by ID."""
-    data = get_registry_data()
+    data = await aget_registry_data()
     for registry in data.get('etsRegistries', []):
         if registry.get('id') == registry_id:
             return registry
@@ -93,19 +103,17 @@ async def create_carbon_registry(
     current_user: User = Depends(get_current_user)
 ):
     """Create a new carbon registry."""
-    data = get_registry_data()
+    data, generation = await aget_registry_data_with_generation()
     
-    # Check if registry ID already exists
-    for r in data.get('carbonRegistries', []):
-        if r.get('id') == registry.id:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Carbon registry with ID '{registry.id}' already exists"
-            )
-    
-    add_registry_to_list(data['carbonRegistries'], registry.model_dump())
+    try:
+        RegistryIndex(data['carbonRegistries']).add(registry.model_dump())
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Carbon registry with ID '{registry.id}' already exists"
+        )
     data['totals'] = calculate_totals(data)
-    save_registry_data(data)
+    await asave_registry_data(data, generation)
     
     return MessageResponse(message=f"Carbon registry '{registry.name}' created successfully")
 
@@ -116,18 +124,17 @@ async def create_rec_registry(
     current_user: User = Depends(get_current_user)
 ):
     """Create a new REC registry."""
-    data = get_registry_data()
-    
-    for r in data.get('recRegistries', []):
-        if r.get('id') == registry.id:
-            raise HTTPException(
-                status_code=400,
-                detail=f"REC registry with ID '{registry.id}' already exists"
-            )
+    data, generation = await aget_registry_data_with_generation()
     
-    add_registry_to_list(data['recRegistries'], registry.model_dump())
+    try:
+        RegistryIndex(data['recRegistries']).add(registry.model_dump())
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"REC registry with ID '{registry.id}' already exists"
+        )
     data['totals'] = calculate_totals(data)
-    save_registry_data(data)
+    await asave_registry_data(data, generation)
     
     return MessageResponse(message=f"REC registry '{registry.name}' created successfully")
 
@@ -138,18 +145,17 @@ async def create_ets_registry(
     current_user: User = Depends(get_current_user)
 ):
     """Create a new ETS registry."""
-    data = get_registry_data()
-    
-    for r in data.get('etsRegistries', []):
-        if r.get('id') == registry.id:
-            raise HTTPException(
-                status_code=400,
-                detail=f"ETS registry with ID '{registry.id}' already exists"
-            )
+    data, generation = await aget_registry_data_with_generation()
     
-    add_registry_to_list(data['etsRegistries'], registry.model_dump())
+    try:
+        RegistryIndex(data['etsRegistries']).add(registry.model_dump())
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"ETS registry with ID '{registry.id}' already exists"
+        )
     data['totals'] = calculate_totals(data)
-    save_registry_data(data)
+    await asave_registry_data(data, generation)
     
     return MessageResponse(message=f"ETS registry '{registry.name}' created successfully")
 
@@ -163,22 +169,18 @@ async def update_carbon_registry(
     current_user: User = Depends(get_current_user)
 ):
     """Update a carbon registry."""
-    data = get_registry_data()
+    data, generation = await aget_registry_data_with_generation()
     
-    updated = update_registry_in_list(
-        data['carbonRegistries'],
-        registry_id,
-        registry.model_dump()
-    )
+    index = RegistryIndex(data['carbonRegistries'])
     
-    if not updated:
+    if not index.update(registry_id, registry.model_dump()):
         raise HTTPException(
             status_code=404,
             detail=f"Carbon registry '{registry_id}' not found"
         )
     
     data['totals'] = calculate_totals(data)
-    save_registry_data(data)
+    await asave_registry_data(data, generation)
     
     return MessageResponse(message=f"Carbon registry '{registry.name}' updated successfully")
 
@@ -190,22 +192,18 @@ async def update_rec_registry(
     current_user: User = Depends(get_current_user)
 ):
     """Update a REC registry."""
-    data = get_registry_data()
+    data, generation = await aget_registry_data_with_generation()
     
-    updated = update_registry_in_list(
-        data['recRegistries'],
-        registry_id,
-        registry.model_dump()
-    )
+    index = RegistryIndex(data['recRegistries'])
     
-    if not updated:
+    if not index.update(registry_id, registry.model_dump()):
         raise HTTPException(
             status_code=404,
             detail=f"REC registry '{registry_id}' not found"
         )
     
     data['totals'] = calculate_totals(data)
-    save_registry_data(data)
+    await asave_registry_data(data, generation)
     
     return MessageResponse(message=f"REC registry '{registry.name}' updated successfully")
 
@@ -217,22 +215,18 @@ async def update_ets_registry(
     current_user: User = Depends(get_current_user)
 ):
     """Update an ETS registry."""
-    data = get_registry_data()
+    data, generation = await aget_registry_data_with_generation()
     
-    updated = update_registry_in_list(
-        data['etsRegistries'],
-        registry_id,
-        registry.model_dump()
-    )
+    index = RegistryIndex(data['etsRegistries'])
     
-    if not updated:
+    if not index.update(registry_id, registry.model_dump()):
         raise HTTPException(
             status_code=404,
             detail=f"ETS registry '{registry_id}' not found"
         )
     
     data['totals'] = calculate_totals(data)
-    save_registry_data(data)
+    await asave_registry_data(data, generation)
     
     return MessageResponse(message=f"ETS registry '{registry.name}' updated successfully")
 
@@ -245,18 +239,18 @@ async def delete_carbon_registry(
     current_user: User = Depends(get_current_user)
 ):
     """Delete a carbon registry."""
-    data = get_registry_data()
+    data, generation = await aget_registry_data_with_generation()
     
-    deleted = delete_registry_from_list(data['carbonRegistries'], registry_id)
+    index = RegistryIndex(data['carbonRegistries'])
     
-    if not deleted:
+    if not index.delete(registry_id):
         raise HTTPException(
             status_code=404,
             detail=f"Carbon registry '{registry_id}' not found"
         )
     
     data['totals'] = calculate_totals(data)
-    save_registry_data(data)
+    await asave_registry_data(data, generation)
     
     return MessageResponse(message=f"Carbon registry '{registry_id}' deleted successfully")
 
@@ -267,18 +261,18 @@ async def delete_rec_registry(
     current_user: User = Depends(get_current_user)
 ):
     """Delete a REC registry."""
-    data = get_registry_data()
+    data, generation = await aget_registry_data_with_generation()
     
-    deleted = delete_registry_from_list(data['recRegistries'], registry_id)
+    index = RegistryIndex(data['recRegistries'])
     
-    if not deleted:
+    if not index.delete(registry_id):
         raise HTTPException(
             status_code=404,
             detail=f"REC registry '{registry_id}' not found"
         )
     
     data['totals'] = calculate_totals(data)
-    save_registry_data(data)
+    await asave_registry_data(data, generation)
     
     return MessageResponse(message=f"REC registry '{registry_id}' deleted successfully")
 
@@ -289,17 +283,17 @@ async def delete_ets_registry(
     current_user: User = Depends(get_current_user)
 ):
     """Delete an ETS registry."""
-    data = get_registry_data()
+    data, generation = await aget_registry_data_with_generation()
     
-    deleted = delete_registry_from_list(data['etsRegistries'], registry_id)
+    index = RegistryIndex(data['etsRegistries'])
     
-    if not deleted:
+    if not index.delete(registry_id):
         raise HTTPException(
             status_code=404,
             detail=f"ETS registry '{registry_id}' not found"
         )
     
     data['totals'] = calculate_totals(data)
-    save_registry_data(data)
+    await asave_registry_data(data, generation)
     
     return MessageResponse(message=f"ETS registry '{registry_id}' deleted successfully")
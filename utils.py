@@ -1,8 +1,19 @@
-import json
+import asyncio
+import copy
+import gzip
+import os
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+import ijson
+import orjson
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from google.api_core.exceptions import PreconditionFailed
 from google.cloud import storage
 from google.cloud.exceptions import NotFound
 
@@ -25,6 +36,18 @@ def get_gcs_client():
     global _gcs_client
     if _gcs_client is None:
         _gcs_client = storage.Client()
+        # The default transport pool holds only 10 connections; under
+        # concurrent requests that means fresh TLS handshakes once the pool
+        # is exhausted. Mount a larger keep-alive pool with retries so
+        # connections are reused across requests.
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.2),
+        )
+        _gcs_client._http.mount('https://', adapter)
+        _gcs_client._http.mount('http://', adapter)
+        _gcs_client._http.headers['Connection'] = 'keep-alive'
     return _gcs_client
 
 
@@ -34,32 +57,107 @@ def get_gcs_bucket():
     return client.bucket(GCS_BUCKET_NAME)
 
 
+class ConcurrentModificationError(Exception):
+    """Raised when a save loses the race against another writer.
+
+    The client should re-fetch and retry the request; main.py maps this to
+    a 409 response.
+    """
+
+
 # ============ GCS Read/Write Functions ============
 
-def read_json_from_gcs(filename: str) -> dict:
-    """Read and parse a JSON file from Google Cloud Storage."""
+# Parsed-JSON cache keyed by filename, validated by the blob's generation.
+# A cache hit only costs a metadata reload (HEAD) instead of a full
+# download + parse. Guarded by a lock since uvicorn workers share the process.
+_json_cache: dict = {}  # filename -> (generation, parsed dict)
+_json_cache_lock = threading.Lock()
+
+
+def read_json_from_gcs_with_generation(filename: str) -> tuple:
+    """Read a JSON file from GCS, returning (data, generation).
+
+    The generation can be passed back to write_json_to_gcs as
+    if_generation_match for an optimistic-concurrency read-modify-write.
+    """
     try:
         bucket = get_gcs_bucket()
         blob = bucket.blob(filename)
-        # Reload blob metadata to ensure we get the latest version
-        blob.reload()
-        content = blob.download_as_text()
-        return json.loads(content)
+        with _json_cache_lock:
+            cached = _json_cache.get(filename)
+        if cached is not None:
+            # Revalidate the cached parse with a cheap metadata HEAD; the
+            # full download below is only needed when the blob changed.
+            blob.reload()
+            if cached[0] == blob.generation:
+                # Unchanged on GCS; reuse the parsed object. This is the
+                # dict aliased by the caches, so it must be treated as
+                # read-only - mutating handlers get a private deep copy via
+                # read_json_file_with_generation.
+                return cached[1], cached[0]
+        # Cold read: download directly, no separate reload. The download
+        # response populates blob.generation as a side effect.
+        content = blob.download_as_bytes()
+        data = orjson.loads(content)
+        with _json_cache_lock:
+            _json_cache[filename] = (blob.generation, data)
+        return data, blob.generation
     except NotFound:
         raise FileNotFoundError(f"File not found in GCS: gs://{GCS_BUCKET_NAME}/{filename}")
     except Exception as e:
         raise Exception(f"Error reading from GCS: {str(e)}")
 
 
-def write_json_to_gcs(filename: str, data: dict) -> None:
-    """Write data to a JSON file in Google Cloud Storage."""
+def read_json_from_gcs(filename: str) -> dict:
+    """Read and parse a JSON file from Google Cloud Storage."""
+    data, _ = read_json_from_gcs_with_generation(filename)
+    return data
+
+
+def write_json_to_gcs(filename: str, data: dict, if_generation_match: Optional[int] = None) -> None:
+    """Write data to a JSON file in Google Cloud Storage.
+
+    When if_generation_match is given the upload only succeeds if the blob
+    still has that generation, turning read-modify-write into an atomic
+    compare-and-swap. If a concurrent writer got there first the lost update
+    is surfaced as ConcurrentModificationError rather than silently
+    overwriting the winner's data with ours.
+    """
     try:
         bucket = get_gcs_bucket()
         blob = bucket.blob(filename)
-        content = json.dumps(data, indent=2, ensure_ascii=False)
+        # Compact output: the blob is only consumed by this API and the
+        # frontend, so indentation would just inflate payload size and
+        # serialize time.
+        content = gzip.compress(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS),
+                                compresslevel=6)
         # Set cache control to prevent caching issues
         blob.cache_control = 'no-cache, no-store, must-revalidate'
-        blob.upload_from_string(content, content_type='application/json')
+        # Store gzip-compressed; GCS transparently decompresses on download
+        # (decompressive transcoding), so readers are unaffected while the
+        # stored object and upload bandwidth shrink ~10x.
+        blob.content_encoding = 'gzip'
+        try:
+            blob.upload_from_string(content, content_type='application/json',
+                                    if_generation_match=if_generation_match)
+        except PreconditionFailed:
+            # Our data was derived from a now-stale generation; committing it
+            # anyway would clobber the winner's write. Evict the cached copies
+            # so the next read fetches the winner's data, and let the caller
+            # retry against it.
+            with _json_cache_lock:
+                _json_cache.pop(filename, None)
+            with _ttl_cache_lock:
+                _ttl_cache.pop(filename, None)
+            raise ConcurrentModificationError(
+                f"'{filename}' was modified by another request; please retry"
+            )
+        # The upload response carries the new generation; cache the data we
+        # just wrote so the next read is a pure memory hit.
+        with _json_cache_lock:
+            _json_cache[filename] = (blob.generation, data)
+    except ConcurrentModificationError:
+        raise
     except Exception as e:
         raise Exception(f"Error writing to GCS: {str(e)}")
 
@@ -72,19 +170,27 @@ def read_json_file_local(filename: str) -> dict:
     if not filepath.exists():
         raise FileNotFoundError(f"File not found: {filepath}")
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(filepath, 'rb') as f:
+        return orjson.loads(f.read())
 
 
 def write_json_file_local(filename: str, data: dict) -> None:
-    """Write data to a JSON file in the local public/Data directory."""
+    """Write data to a JSON file in the local public/Data directory.
+
+    Writes to a temp file and os.replace()s it into place so a crash or
+    uvicorn reload mid-write never leaves a truncated JSON file behind.
+    """
     filepath = PUBLIC_DATA_DIR / filename
-    
+
     # Ensure directory exists
     filepath.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+
+    tmp_path = filepath.with_suffix(filepath.suffix + '.tmp')
+    with open(tmp_path, 'wb', buffering=1 << 20) as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
 
 
 # ============ Unified Read/Write Functions ============
@@ -97,101 +203,345 @@ def read_json_file(filename: str) -> dict:
         return read_json_file_local(filename)
 
 
-def write_json_file(filename: str, data: dict) -> None:
+def read_json_file_with_generation(filename: str) -> tuple:
+    """Read a JSON file, returning (data, generation).
+
+    Generation is None for local files, which have no versioning. The
+    returned dict is a private deep copy: mutating handlers edit it in place
+    before saving, and handing out the cached reference would leak
+    half-applied (or never-persisted, if the write fails) changes to
+    concurrent readers.
+    """
+    if USE_GCS:
+        data, generation = read_json_from_gcs_with_generation(filename)
+        return copy.deepcopy(data), generation
+    else:
+        return read_json_file_local(filename), None
+
+
+def write_json_file(filename: str, data: dict, if_generation_match: Optional[int] = None) -> None:
     """Write data to a JSON file (to GCS or local based on config)."""
     if USE_GCS:
-        write_json_to_gcs(filename, data)
+        write_json_to_gcs(filename, data, if_generation_match=if_generation_match)
     else:
         write_json_file_local(filename, data)
 
 
+# ============ TTL Read Cache ============
+
+# Short-lived cache for read-heavy endpoints (dashboard polling): within the
+# TTL a GET touches no network at all, not even the generation check. Writes
+# repopulate the entry so readers never see data older than the TTL. Entries
+# hold (parsed dict, serialized bytes, etag) so full-document GETs can return
+# the bytes as-is without re-serializing per request, or answer 304 outright.
+_ttl_cache: TTLCache = TTLCache(maxsize=8, ttl=15)
+_ttl_cache_lock = threading.Lock()
+
+
+def _serialize_json(data: dict) -> bytes:
+    """Serialize data the same way the write path does (compact orjson)."""
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _current_etag(filename: str) -> Optional[str]:
+    """ETag for the file derived from its last-seen GCS generation.
+
+    None for local files, which have no generation to validate against.
+    """
+    if not USE_GCS:
+        return None
+    with _json_cache_lock:
+        cached = _json_cache.get(filename)
+    if cached is None or cached[0] is None:
+        return None
+    return f'W/"{cached[0]}"'
+
+
+def _ttl_cache_put(filename: str, data: dict) -> tuple:
+    """Serialize once and store (data, bytes, etag) in the TTL cache."""
+    entry = (data, _serialize_json(data), _current_etag(filename))
+    with _ttl_cache_lock:
+        _ttl_cache[filename] = entry
+    return entry
+
+
+def _read_json_file_cached(filename: str, fresh: bool = False) -> tuple:
+    """Read a JSON file through the TTL cache, returning (data, bytes, etag).
+
+    fresh=True forces a re-read.
+    """
+    if not fresh:
+        with _ttl_cache_lock:
+            cached = _ttl_cache.get(filename)
+        if cached is not None:
+            return cached
+    # read_json_file refreshes the generation cache; _ttl_cache_put then
+    # derives the matching etag from it.
+    return _ttl_cache_put(filename, read_json_file(filename))
+
+
+# ============ Streaming Section Reads ============
+
+def _iter_json_section_local(filename: str, prefix: str):
+    """Stream items from one section of a local JSON file without
+    materializing the whole document (e.g. prefix 'carbonRegistries.item')."""
+    filepath = PUBLIC_DATA_DIR / filename
+    if not filepath.exists():
+        raise FileNotFoundError(f"File not found: {filepath}")
+    with open(filepath, 'rb') as fp:
+        yield from ijson.items(fp, prefix, use_float=True)
+
+
+def _iter_registry_section(section: str):
+    """Iterate one section of the registry data.
+
+    GCS objects are stored gzip-encoded (see write_json_to_gcs) and
+    transcoded downloads reject the ranged reads that blob.open() issues, so
+    remote reads go through the cached full-document path - which also means
+    the fetch is shared with every other endpoint instead of re-transferred
+    per poll. Streaming is reserved for local uncompressed files on a cache
+    miss, where it keeps peak memory at one registry at a time.
+    """
+    if USE_GCS:
+        return iter(_read_json_file_cached(GCS_REGISTRY_FILE)[0].get(section, []))
+    with _ttl_cache_lock:
+        cached = _ttl_cache.get(GCS_REGISTRY_FILE)
+    if cached is not None:
+        return iter(cached[0].get(section, []))
+    return _iter_json_section_local(GCS_REGISTRY_FILE, f'{section}.item')
+
+
+def iter_carbon_registries():
+    """Iterate the carbon registries."""
+    return _iter_registry_section('carbonRegistries')
+
+
+def iter_rec_registries():
+    """Iterate the REC registries."""
+    return _iter_registry_section('recRegistries')
+
+
+def list_carbon_registries() -> list:
+    """Get the carbon registries as a list."""
+    return list(iter_carbon_registries())
+
+
+def list_rec_registries() -> list:
+    """Get the REC registries as a list."""
+    return list(iter_rec_registries())
+
+
+async def alist_carbon_registries() -> list:
+    """Async wrapper for list_carbon_registries."""
+    return await asyncio.to_thread(list_carbon_registries)
+
+
+async def alist_rec_registries() -> list:
+    """Async wrapper for list_rec_registries."""
+    return await asyncio.to_thread(list_rec_registries)
+
+
+# strftime re-parses the format string and hits locale state on every call;
+# the lastUpdated stamp only has day resolution, so cache the formatted
+# string and refresh it at most once a minute.
+_today = ('', 0.0)
+
+
+def _today_str() -> str:
+    """Today's date as 'YYYY-MM-DD', recomputed at most once per minute."""
+    global _today
+    now = time.time()
+    if now - _today[1] > 60:
+        _today = (datetime.now().strftime('%Y-%m-%d'), now)
+    return _today[0]
+
+
 # ============ Registry Data Functions ============
 
-def get_registry_data() -> dict:
+def get_registry_data(fresh: bool = False) -> dict:
     """Get the current registry data."""
-    return read_json_file(GCS_REGISTRY_FILE)
+    return _read_json_file_cached(GCS_REGISTRY_FILE, fresh=fresh)[0]
+
+
+def get_registry_payload(fresh: bool = False) -> tuple:
+    """Get the registry data pre-serialized as (JSON bytes, etag)."""
+    entry = _read_json_file_cached(GCS_REGISTRY_FILE, fresh=fresh)
+    return entry[1], entry[2]
+
+
+def get_registry_data_with_generation() -> tuple:
+    """Get the current registry data together with its GCS generation."""
+    return read_json_file_with_generation(GCS_REGISTRY_FILE)
+
+
+def save_registry_data(data: dict, if_generation_match: Optional[int] = None) -> None:
+    """Save registry data and update metadata.
+
+    Pass the generation captured at read time to detect concurrent writers.
+    """
+    data['lastUpdated'] = _today_str()
+    write_json_file(GCS_REGISTRY_FILE, data, if_generation_match=if_generation_match)
+    _ttl_cache_put(GCS_REGISTRY_FILE, data)
+
+
+async def aget_registry_data(fresh: bool = False) -> dict:
+    """Async wrapper for get_registry_data (runs the blocking GCS I/O in a thread)."""
+    return await asyncio.to_thread(get_registry_data, fresh)
+
+
+async def aget_registry_payload(fresh: bool = False) -> tuple:
+    """Async wrapper for get_registry_payload."""
+    return await asyncio.to_thread(get_registry_payload, fresh)
 
 
-def save_registry_data(data: dict) -> None:
-    """Save registry data and update metadata."""
-    data['lastUpdated'] = datetime.now().strftime('%Y-%m-%d')
-    write_json_file(GCS_REGISTRY_FILE, data)
+async def aget_registry_data_with_generation() -> tuple:
+    """Async wrapper for get_registry_data_with_generation."""
+    return await asyncio.to_thread(get_registry_data_with_generation)
+
+
+async def asave_registry_data(data: dict, if_generation_match: Optional[int] = None) -> None:
+    """Async wrapper for save_registry_data (runs the blocking GCS I/O in a thread)."""
+    await asyncio.to_thread(save_registry_data, data, if_generation_match)
 
 
 # ============ Insights Data Functions ============
 
-def get_insights_data() -> dict:
+def get_insights_data(fresh: bool = False) -> dict:
     """Get the current insights data."""
-    return read_json_file(GCS_INSIGHTS_FILE)
+    return _read_json_file_cached(GCS_INSIGHTS_FILE, fresh=fresh)[0]
+
+
+def get_insights_payload(fresh: bool = False) -> tuple:
+    """Get the insights data pre-serialized as (JSON bytes, etag)."""
+    entry = _read_json_file_cached(GCS_INSIGHTS_FILE, fresh=fresh)
+    return entry[1], entry[2]
+
+
+def get_insights_data_with_generation() -> tuple:
+    """Get the current insights data together with its GCS generation."""
+    return read_json_file_with_generation(GCS_INSIGHTS_FILE)
+
+
+def save_insights_data(data: dict, if_generation_match: Optional[int] = None) -> None:
+    """Save insights data and update metadata.
+
+    Pass the generation captured at read time to detect concurrent writers.
+    """
+    data['lastUpdated'] = _today_str()
+    write_json_file(GCS_INSIGHTS_FILE, data, if_generation_match=if_generation_match)
+    _ttl_cache_put(GCS_INSIGHTS_FILE, data)
+
+
+async def aget_insights_data(fresh: bool = False) -> dict:
+    """Async wrapper for get_insights_data (runs the blocking GCS I/O in a thread)."""
+    return await asyncio.to_thread(get_insights_data, fresh)
+
 
+async def aget_insights_payload(fresh: bool = False) -> tuple:
+    """Async wrapper for get_insights_payload."""
+    return await asyncio.to_thread(get_insights_payload, fresh)
 
-def save_insights_data(data: dict) -> None:
-    """Save insights data and update metadata."""
-    data['lastUpdated'] = datetime.now().strftime('%Y-%m-%d')
-    write_json_file(GCS_INSIGHTS_FILE, data)
+
+async def aget_insights_data_with_generation() -> tuple:
+    """Async wrapper for get_insights_data_with_generation."""
+    return await asyncio.to_thread(get_insights_data_with_generation)
+
+
+async def asave_insights_data(data: dict, if_generation_match: Optional[int] = None) -> None:
+    """Async wrapper for save_insights_data (runs the blocking GCS I/O in a thread)."""
+    await asyncio.to_thread(save_insights_data, data, if_generation_match)
 
 
 # ============ Helper Functions ============
 
+def _sum_registry_list(registries: list) -> tuple:
+    """Accumulate issued/retired totals and countries in a single pass."""
+    issued = 0
+    retired = 0
+    countries = set()
+    for r in registries:
+        issued += r.get('issued', 0) or 0
+        retired += r.get('retired', 0) or 0
+        country = r.get('country')
+        if country:
+            countries.add(country)
+    return issued, retired, countries, len(registries)
+
+
 def calculate_totals(data: dict) -> dict:
     """Recalculate totals based on current registry data."""
-    carbon_issued = sum(r.get('issued', 0) or 0 for r in data.get('carbonRegistries', []))
-    carbon_retired = sum(r.get('retired', 0) or 0 for r in data.get('carbonRegistries', []))
-    
-    rec_issued = sum(r.get('issued', 0) or 0 for r in data.get('recRegistries', []))
-    rec_retired = sum(r.get('retired', 0) or 0 for r in data.get('recRegistries', []))
-    
-    # Count unique countries
-    all_countries = set()
-    for r in data.get('carbonRegistries', []):
-        all_countries.add(r.get('country', ''))
-    for r in data.get('recRegistries', []):
-        all_countries.add(r.get('country', ''))
-    for r in data.get('etsRegistries', []):
-        all_countries.add(r.get('country', ''))
-    all_countries.discard('')
-    
+    carbon_issued, carbon_retired, carbon_countries, carbon_count = (
+        _sum_registry_list(data.get('carbonRegistries', []))
+    )
+    rec_issued, rec_retired, rec_countries, rec_count = (
+        _sum_registry_list(data.get('recRegistries', []))
+    )
+    _, _, ets_countries, ets_count = _sum_registry_list(data.get('etsRegistries', []))
+
+    all_countries = carbon_countries | rec_countries | ets_countries
+
     return {
         'carbon': {
-            'registries': len(data.get('carbonRegistries', [])),
+            'registries': carbon_count,
             'issued': carbon_issued,
             'retired': carbon_retired
         },
         'rec': {
-            'registries': len(data.get('recRegistries', [])),
+            'registries': rec_count,
             'issued': rec_issued,
             'retired': rec_retired
         },
         'ets': {
-            'registries': len(data.get('etsRegistries', []))
+            'registries': ets_count
         },
-        'totalRegistries': (
-            len(data.get('carbonRegistries', [])) + 
-            len(data.get('recRegistries', [])) + 
-            len(data.get('etsRegistries', []))
-        ),
+        'totalRegistries': carbon_count + rec_count + ets_count,
         'totalCountries': len(all_countries)
     }
 
 
-def update_registry_in_list(registries: list, registry_id: str, updated_data: dict) -> bool:
-    """Update a registry in a list by ID. Returns True if found and updated."""
-    for i, registry in enumerate(registries):
-        if registry.get('id') == registry_id:
-            registries[i] = updated_data
-            return True
-    return False
-
-
-def add_registry_to_list(registries: list, new_registry: dict) -> None:
-    """Add a new registry to a list."""
-    registries.append(new_registry)
+def _index_by_id(registries: list) -> dict:
+    """Build an id -> position dict for a registry list (O(1) lookups)."""
+    return {r.get('id'): i for i, r in enumerate(registries)}
+
+
+class RegistryIndex:
+    """Id-indexed view over a registry list.
+
+    Build one per request and route add/update/delete through it: each
+    operation is an O(1) dict lookup instead of a linear scan, and adding a
+    duplicate id raises ValueError. Mutations keep the index in sync with
+    the underlying list.
+    """
+
+    def __init__(self, registries: list):
+        self._registries = registries
+        self._by_id = _index_by_id(registries)
+
+    def add(self, registry: dict) -> None:
+        """Append a registry; raises ValueError if the ID already exists."""
+        registry_id = registry.get('id')
+        if registry_id in self._by_id:
+            raise ValueError(f"Registry with ID '{registry_id}' already exists")
+        self._by_id[registry_id] = len(self._registries)
+        self._registries.append(registry)
+
+    def update(self, registry_id: str, updated_data: dict) -> bool:
+        """Replace a registry in place. Returns True if found."""
+        idx = self._by_id.get(registry_id)
+        if idx is None:
+            return False
+        self._registries[idx] = updated_data
+        return True
+
+    def delete(self, registry_id: str) -> bool:
+        """Delete a registry, preserving list order. Returns True if found."""
+        idx = self._by_id.pop(registry_id, None)
+        if idx is None:
+            return False
+        del self._registries[idx]
+        for rid, i in self._by_id.items():
+            if i > idx:
+                self._by_id[rid] = i - 1
+        return True
 
 
-def delete_registry_from_list(registries: list, registry_id: str) -> bool:
-    """Delete a registry from a list by ID. Returns True if found and deleted."""
-    for i, registry in enumerate(registries):
-        if registry.get('id') == registry_id:
-            del registries[i]
-            return True
-    return False